@@ -0,0 +1,99 @@
+"""
+This module provides helpers for reading the KdB CSV file and writing
+converted data to a JSON file.
+
+Both use a large buffer to reduce the number of system calls. The CSV file is
+opened in universal newlines mode, so line breaks inside quoted cells are read
+as "\n" as before, and its data rows are read with read_csv_rows, which
+handles blank lines and short rows like csv.DictReader. JSON data is encoded
+in one shot; if orjson is installed it is used for encoding, otherwise the
+standard json module is used. By default the output is compact, which lets
+the json module use its C encoder; pass pretty=True to get indented output
+for debugging.
+
+Example usage:
+    with open_csv("kdb.csv") as f:
+        rows = list(read_csv_rows(f))
+    dump_json({"courses": []}, "kdb_structural.json")
+"""
+
+import csv
+import json
+from typing import Any, Iterator, List, Optional, TextIO, cast
+
+from subject_dataclass import Subject
+
+try:
+    import orjson  # type: ignore[import-not-found]
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+BUFFER_SIZE = 1 << 20
+
+
+def open_csv(input_path: str) -> TextIO:
+    """
+    Opens a CSV file for reading with the csv module.
+
+    Args:
+        input_path (str): The path to the CSV file.
+
+    Returns:
+        TextIO: The opened file object.
+    """
+    return open(input_path, mode="r", encoding="utf-8", buffering=BUFFER_SIZE)
+
+
+def read_csv_rows(csv_file: TextIO) -> Iterator[List[Optional[str]]]:
+    """
+    Reads the data rows of a CSV file.
+
+    The header row is skipped, and so are blank lines, which csv.reader
+    returns as empty lists while csv.DictReader skips them. Rows shorter than
+    Subject.CSV_HEADER are padded with None, as csv.DictReader with that
+    header fills missing columns.
+
+    Args:
+        csv_file (TextIO): The CSV file object opened by open_csv.
+
+    Returns:
+        Iterator[List[Optional[str]]]: An iterator of the data rows.
+    """
+    width = len(Subject.CSV_HEADER)
+    rows = (row for row in csv.reader(csv_file) if row)
+    next(rows, None)  # Skip the header row
+    for row in rows:
+        # 行をコピーせずに、欠けた列をNoneで埋める
+        padded = cast(List[Optional[str]], row)
+        if len(row) < width:
+            padded.extend([None] * (width - len(row)))
+        yield padded
+
+
+def dump_json(data: Any, output_path: str, pretty: bool = False) -> None:
+    """
+    Writes data to a JSON file.
+
+    Args:
+        data (Any): The data to be written.
+        output_path (str): The path to the JSON file.
+        pretty (bool): Whether to indent the output.
+
+    Returns:
+        None
+    """
+    if HAS_ORJSON:
+        # orjsonはC拡張なので、pylintはメンバーを解決できない
+        # pylint: disable=no-member
+        enc = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    elif pretty:
+        enc = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    else:
+        enc = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+
+    with open(output_path, mode="wb", buffering=BUFFER_SIZE) as f:
+        f.write(enc)
@@ -2,9 +2,7 @@
 This module provides functions for parsing a CSV file and converting it to a
 JSON file.
 
-It defines a dataclass called Subject, which represents a subject with its
-attributes.
-The module also includes a function called convert_csv_to_json, which takes a
+The module includes a function called convert_csv_to_json, which takes a
 CSV file path and a JSON file path as input and converts the CSV file to a
 JSON file.
 
@@ -12,11 +10,19 @@ Example usage:
     convert_csv_to_json("kdb.csv", "kdb.json")
 """
 
-import csv
-import json
 import logging
 
-from subject_dataclass import Subject
+from file_utils import dump_json, open_csv, read_csv_rows
+from subject_dataclass import (
+    IDX_CLASS_ID,
+    IDX_CREDITS,
+    IDX_MODULE,
+    IDX_NAME,
+    IDX_PERIOD,
+    IDX_REMARKS,
+    IDX_ROOM,
+    normalize_credits,
+)
 
 # ログの設定
 logging.basicConfig(
@@ -24,37 +30,38 @@ logging.basicConfig(
 )
 
 
-def convert_csv_to_json(csv_file_path: str, json_file_path: str) -> None:
+def convert_csv_to_json(
+    csv_file_path: str, json_file_path: str, pretty: bool = False
+) -> None:
     """
     Converts a CSV file to a JSON file.
 
     Args:
         csv_file_path (str): The path to the CSV file.
         json_file_path (str): The path to the JSON file.
+        pretty (bool): Whether to indent the JSON output.
 
     Returns:
         None
     """
-    data = {}
-    with open(csv_file_path, mode="r", encoding="utf-8") as csv_file:
-        csv_reader = csv.DictReader(csv_file, fieldnames=Subject.CSV_HEADER)
-        next(csv_reader)  # Skip the header row
-        for row in csv_reader:
-            subject = Subject.from_csv_row(row)
-            # 科目番号をキーとして、科目情報をリストとして格納
-            # { "科目番号": ["科目名","モジュール","曜時限","教室","備考","単位数"], ・・・}
-            data[subject.class_id] = [
-                subject.name,
-                subject.module,
-                subject.period,
-                subject.room,
-                subject.remarks,
-                subject.credits
+    with open_csv(csv_file_path) as csv_file:
+        # 科目番号をキーとして、科目情報をリストとして格納
+        # { "科目番号": ["科目名","モジュール","曜時限","教室","備考","単位数"], ・・・}
+        # Subjectを経由せず、列番号で直接取り出す
+        data = {
+            row[IDX_CLASS_ID]: [
+                row[IDX_NAME],
+                row[IDX_MODULE],
+                row[IDX_PERIOD],
+                row[IDX_ROOM],
+                row[IDX_REMARKS],
+                normalize_credits(row[IDX_CREDITS]),
             ]
+            for row in read_csv_rows(csv_file)
+        }
 
-    with open(json_file_path, mode="w", encoding="utf-8") as json_file:
-        json.dump(data, json_file, ensure_ascii=False, indent=2)
-        logging.info("CSVデータを'%s'へ変換しました。", json_file_path)
+    dump_json(data, json_file_path, pretty=pretty)
+    logging.info("CSVデータを'%s'へ変換しました。", json_file_path)
 
 
 if __name__ == "__main__":
@@ -10,12 +10,16 @@ Example usage:
 """
 
 import csv
+import functools
+import itertools
 import json
-from typing import Dict, List
-import xml.etree.ElementTree as ET
+from typing import BinaryIO, Dict, List, Tuple, Type
+from xml.sax.saxutils import escape
 from enum import Enum
+from file_utils import BUFFER_SIZE, open_csv
 
 
+@functools.lru_cache(maxsize=None)
 def get_translations(lang: str) -> Dict[str, str]:
     """
     Retrieves translations for a specific language.
@@ -47,6 +51,7 @@ def str2tag_name(string: str) -> str:
     return string.lower().replace(" ", "_").replace("(", "").replace(")", "")
 
 
+@functools.lru_cache(maxsize=None)
 def course_enum(lang: str) -> Enum:
     """
     Create an enumeration for courses based on the specified language.
@@ -63,48 +68,73 @@ def course_enum(lang: str) -> Enum:
         return Enum("Course", cols[lang], start=0)
 
 
-def insert_attr_element(parent: ET.Element, name: str, value: str) -> ET.Element:
+def column_tags(course_columns: Type[Enum]) -> List[Tuple[int, bytes, bytes, bytes]]:
     """
-    Inserts a new attribute element into the parent element with the given
-    name and value.
+    Encode the tags of each column in advance.
 
     Args:
-        parent (ET.Element): The parent element to insert the attribute
-        element into.
-        name (str): The name of the attribute element.
-        value (str): The value of the attribute element.
+        course_columns (Type[Enum]): The Course class object.
 
     Returns:
-        ET.Element: The newly created attribute element.
+        List[Tuple[int, bytes, bytes, bytes]]: The column index and its opening,
+        closing and empty tags for each column.
+
     """
-    child = ET.SubElement(parent, str2tag_name(name))
-    child.text = value
-    return child
+    columns = []
+    for attr in course_columns:
+        tag = str2tag_name(attr.name)
+        columns.append(
+            (
+                attr.value,
+                f"<{tag}>".encode("utf-8"),
+                f"</{tag}>".encode("utf-8"),
+                f"<{tag} />".encode("utf-8"),
+            )
+        )
+    return columns
 
 
-def csv2xml(reader, course_enum, lang: str) -> ET.Element:
+def csv2xml(reader, course_enum, lang: str, out: BinaryIO) -> None:
     """
-    Convert CSV data to XML format.
+    Convert CSV data to XML format and write it to a binary file.
+
+    The tags are written directly instead of building an ElementTree, so no
+    element objects are allocated per row.
 
     Args:
         reader: The CSV reader object.
         course_enum: The Course class object.
         lang (str): The language for translations.
+        out (BinaryIO): The binary file object to write the XML to.
 
     Returns:
-        ET.Element: The root element of the XML tree.
+        None
     """
     # remove the header
     next(reader)
-    root = ET.Element(get_translations(lang)["courses"])
-    for course in reader:
-        course_element = ET.SubElement(root, get_translations(lang)["course"])
-        for attr in map(lambda x: x.name, course_enum):
-            insert_attr_element(
-                parent=course_element, name=attr, value=course[course_enum[attr].value]
-            )
-
-    return root
+    translations = get_translations(lang)
+    courses_tag = translations["courses"]
+    columns = column_tags(course_enum)
+    course_open = f"<{translations['course']}>".encode("utf-8")
+    course_close = f"</{translations['course']}>".encode("utf-8")
+
+    course = next(reader, None)
+    if course is None:
+        # 科目が1つもないときは、ElementTreeと同じく空要素として書き出す
+        out.write(f"<{courses_tag} />".encode("utf-8"))
+        return
+
+    out.write(f"<{courses_tag}>".encode("utf-8"))
+    for course in itertools.chain((course,), reader):
+        out.write(course_open)
+        for index, open_tag, close_tag, empty_tag in columns:
+            value = course[index]
+            if value:
+                out.write(open_tag + escape(value).encode("utf-8") + close_tag)
+            else:
+                out.write(empty_tag)
+        out.write(course_close)
+    out.write(f"</{courses_tag}>".encode("utf-8"))
 
 
 def main(input_file: str, output_file: str, lang: str):
@@ -121,12 +151,11 @@ def main(input_file: str, output_file: str, lang: str):
     """
     course = course_enum(lang)
 
-    with open(input_file, "r", encoding="utf_8") as f:
+    with open_csv(input_file) as f, open(
+        output_file, "wb", buffering=BUFFER_SIZE
+    ) as out:
         reader = csv.reader(f)
-        root = csv2xml(reader, course, lang)
-
-    with open(output_file, "w", encoding="utf_8") as f:
-        f.write(ET.tostring(root, encoding="unicode"))
+        csv2xml(reader, course, lang, out)
 
 
 if __name__ == "__main__":
@@ -8,12 +8,18 @@ Example usage:
 """
 
 import logging
-import csv
-from dataclasses import asdict
-from typing import Dict, List
+from typing import Dict, List, Optional
 import yaml
+from file_utils import BUFFER_SIZE, open_csv, read_csv_rows
 from subject_dataclass import Subject
 
+# libyamlのCSafeDumperは長い二重引用符の文字列を純Python版と違う位置で
+# 折り返すため、読み込んだ内容は同じでも出力テキストには差分が出ることがある
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper  # type: ignore
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -24,14 +30,15 @@ def convert_csv_to_yaml(input_path: str, output_path: str) -> None:
     """
     Main function that converts CSV data to YAML format.
     """
-    subjects: List[Dict[str, str]] = []
-    with open(input_path, mode="r", encoding="utf-8") as f:
-        csv_reader = csv.DictReader(f, fieldnames=Subject.CSV_HEADER)
-        next(csv_reader)  # Skip the header row
-        subjects = [asdict(Subject.from_csv_row(row)) for row in csv_reader]
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        yaml.dump(subjects, f, allow_unicode=True)
+    subjects: List[Dict[str, Optional[str]]] = []
+    with open_csv(input_path) as f:
+        subjects = [
+            Subject.dict_from_csv_list(row)
+            for row in read_csv_rows(f)
+        ]
+
+    with open(output_path, "w", encoding="utf-8", buffering=BUFFER_SIZE) as f:
+        yaml.dump(subjects, f, Dumper=SafeDumper, allow_unicode=True)
 
     logging.info("Conversion completed.")
 
@@ -2,12 +2,18 @@
 Converts CSV data to grad check JSON format.
 """
 
-import json
-import csv
-from dataclasses import dataclass, asdict
-from typing import Dict, List
+from typing import Dict, List, Optional, TypedDict
 import logging
-from subject_dataclass import Subject
+from file_utils import dump_json, open_csv, read_csv_rows
+from subject_dataclass import (
+    IDX_CLASS_ID,
+    IDX_CREDITS,
+    IDX_MODULE,
+    IDX_NAME,
+    IDX_PERIOD,
+    IDX_STANDARD_COURSE_YEAR,
+    normalize_credits,
+)
 
 # Set up logging
 logging.basicConfig(
@@ -15,46 +21,44 @@ logging.basicConfig(
 )
 
 
-@dataclass
-class GradCheckSubject:
+class GradCheckSubject(TypedDict):
     """
     Represents a subject with its attributes for grad check.
     """
-    id: str
-    name: str
-    credits: str
-    registerYear: str
-    modules: str
-    period: str
+
+    id: Optional[str]
+    name: Optional[str]
+    credits: Optional[str]
+    registerYear: Optional[str]
+    modules: Optional[str]
+    period: Optional[str]
 
 
-def convert_csv_to_gradcheck(input_path: str, output_path: str) -> None:
+def convert_csv_to_gradcheck(
+    input_path: str, output_path: str, pretty: bool = False
+) -> None:
     """
     Main function that converts CSV data to grad check JSON format.
     """
-    data: Dict[str, List[Dict[str, str]]] = {"courses": []}
-
-    with open(input_path, mode="r", encoding="utf-8") as csv_file:
-        csv_reader = csv.DictReader(csv_file, fieldnames=Subject.CSV_HEADER)
-        next(csv_reader)  # Skip the header row
-        subjects = [Subject.from_csv_row(row) for row in csv_reader]
+    data: Dict[str, List[GradCheckSubject]] = {"courses": []}
 
+    with open_csv(input_path) as csv_file:
+        # 科目番号が"G"で始まる行だけを変換する
         data["courses"] = [
-            asdict(GradCheckSubject(
-                id=subject.class_id,
-                name=subject.name,
-                credits=subject.credits,
-                registerYear=subject.standard_course_year,
-                modules=subject.module,
-                period=subject.period,
-            ))
-            for subject in subjects
-            if subject.class_id and subject.class_id[0] == "G"
+            GradCheckSubject(
+                id=row[IDX_CLASS_ID],
+                name=row[IDX_NAME],
+                credits=normalize_credits(row[IDX_CREDITS]),
+                registerYear=row[IDX_STANDARD_COURSE_YEAR],
+                modules=row[IDX_MODULE],
+                period=row[IDX_PERIOD],
+            )
+            for row in read_csv_rows(csv_file)
+            if (row[IDX_CLASS_ID] or "")[:1] == "G"
         ]
 
-    with open(output_path, mode="w", encoding="utf-8") as json_file:
-        json.dump(data, json_file, ensure_ascii=False, indent=2)
-        logging.info("CSVデータを'%s'へ変換しました。", output_path)
+    dump_json(data, output_path, pretty=pretty)
+    logging.info("CSVデータを'%s'へ変換しました。", output_path)
 
 
 if __name__ == "__main__":
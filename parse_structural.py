@@ -2,38 +2,37 @@
 This module provides functions for converting a CSV file to a structured JSON file.
 """
 
-import json
-import csv
 import logging
-from dataclasses import asdict
-from typing import Dict, List
+from typing import Dict, List, Optional
+from file_utils import dump_json, open_csv, read_csv_rows
 from subject_dataclass import Subject
 
 
-def convert_csv_to_structural_json(csv_file_path: str, json_file_path: str) -> None:
+def convert_csv_to_structural_json(
+    csv_file_path: str, json_file_path: str, pretty: bool = False
+) -> None:
     """
     Converts a CSV file to a structured JSON file.
 
     Args:
         csv_file_path (str): The path to the CSV file.
         json_file_path (str): The path to the JSON file.
+        pretty (bool): Whether to indent the JSON output.
 
     Returns:
         None
     """
 
-    data: Dict[str, List[Dict[str, str]]] = {"courses": []}
+    data: Dict[str, List[Dict[str, Optional[str]]]] = {"courses": []}
 
-    with open(csv_file_path, mode="r", encoding="utf-8") as csv_file:
-        csv_reader = csv.DictReader(csv_file, fieldnames=Subject.CSV_HEADER)
-        next(csv_reader)  # Skip the header row
-        for row in csv_reader:
-            subject = Subject.from_csv_row(row)
-            data["courses"].append(asdict(subject))
+    with open_csv(csv_file_path) as csv_file:
+        # asdict(Subject)と同じ辞書をSubjectを経由せずに作る
+        data["courses"] = [
+            Subject.dict_from_csv_list(row) for row in read_csv_rows(csv_file)
+        ]
 
-    with open(json_file_path, mode="w", encoding="utf-8") as json_file:
-        json.dump(data, json_file, ensure_ascii=False, indent=2)
-        logging.info("CSVデータを'%s'へ変換しました。", json_file_path)
+    dump_json(data, json_file_path, pretty=pretty)
+    logging.info("CSVデータを'%s'へ変換しました。", json_file_path)
 
 
 if __name__ == "__main__":
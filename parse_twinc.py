@@ -21,227 +21,238 @@ The output JSON file will be named 'kdb_twinc.json' for Japanese
 and 'kdb_twinc_en.json' for English.
 """
 
-import json
 import re
 import sys
-import csv
-from dataclasses import dataclass, field, asdict
-from typing import List, Literal, TypedDict
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Literal, Optional, Tuple, TypedDict
+from operator import attrgetter
 import logging
+from file_utils import dump_json, open_csv, read_csv_rows
 from subject_dataclass import Subject
 
 WEEKDAY_LIST = ("月", "火", "水", "木", "金", "土", "日")
+WEEKDAY_INDEX = {day: i for i, day in enumerate(WEEKDAY_LIST)}
 SEASONS = ("春", "秋")
 MODULE_LIST = ("春A", "春B", "春C", "秋A", "秋B", "秋C", "夏季休業中", "春季休業中")
-SPRING_MODULE_LIST = ("春A", "春B", "春C")
-FALL_MODULE_LIST = ("秋A", "秋B", "秋C")
 SPECIAL_MODULE_LIST = ("夏季休業中", "春季休業中")
-
-
-class PeriodTable(TypedDict):
-    """Type definition for the table data."""
-
-    period: List[List[bool]]
-    focus: bool
-    negotiable: bool
-    asneeded: bool
+# A/B/Cのビットマスク(Aが最下位)から実施学期の文字列への変換表
+SPRING_MODULE_STR = ("", "春A", "春B", "春AB", "春C", "春AC", "春BC", "春ABC")
+FALL_MODULE_STR = ("", "秋A", "秋B", "秋AB", "秋C", "秋AC", "秋BC", "秋ABC")
+PERIODS_PER_DAY = 8
+# 時間割のビット番号から曜時限の文字列への変換表
+PERIOD_LABELS = tuple(
+    day + str(j + 1) for day in WEEKDAY_LIST for j in range(PERIODS_PER_DAY)
+)
+# 実施学期に現れる文字の種類と値
+# season: SEASONSの番号, module: A/B/Cの番号, vacation: 休業中
+MODULE_CHAR_TABLE: Dict[str, Tuple[str, int]] = {
+    **{season: ("season", i) for i, season in enumerate(SEASONS)},
+    **{module: ("module", i) for i, module in enumerate("ABC")},
+    "休": ("vacation", 0),
+}
+# 曜時限の文字列から曜日部分と時限部分を取り出すための変換表と正規表現
+DELETE_TIME_CHARS = str.maketrans("", "", "0123456789-")
+NON_TIME_CHARS_RE = re.compile("[^0-9\\-]+")
+
+
+# 集中・応談・随時のフラグ
+FOCUS = 1
+NEGOTIABLE = 2
+ASNEEDED = 4
+# 範囲外の時限しかなかったときのフラグ
+INVALID = 8
+# 時間割が空のときのフラグごとの曜時限 (集中 > 応談 > 随時の順に優先)
+SENTINEL_PERIOD = tuple(
+    "集中" if flags & FOCUS else "応談" if flags & NEGOTIABLE else "随時"
+    for flags in range(8)
+)
+
+# (時間割, フラグ)
+# 時間割は曜日iの時限j+1がビット i * PERIODS_PER_DAY + j に対応する
+PeriodTable = Tuple[int, int]
 
 
 Lang = Literal["ja", "en"]
 Terms = List[List[str]]
 
 
-@dataclass
-class Class:
-    class_id: str
-    name: str
-    description: str
-    module: List[List[str]] = field(default_factory=list)
-    period: List[List[str]] = field(default_factory=list)
-    room: str = field(default=" ")  # デフォルト値を指定
+class Class(TypedDict):
+    """Type definition for the class data in the TwinC format."""
 
+    class_id: Optional[str]
+    name: Optional[str]
+    module: List[List[str]]
+    period: List[List[str]]
+    room: Optional[str]
+    description: Optional[str]
 
-def parsed_module(terms: Terms) -> List[List[str]]:
+
+def subjects_from_csv(input_file: str) -> Iterator[Subject]:
     """
-    This function parses the module list and returns a list of module strings.
+    This function reads the CSV file and yields Subject dataclass instances
+    one row at a time, so the whole file is never held in memory.
 
     Args:
-        terms (Terms): The module list.
+        input_file (str): The input CSV file.
 
     Returns:
-        List[List[str]]: A list of module strings.
+        Iterator[Subject]: An iterator of Subject dataclass instances.
     """
-    module = terms
-
-    for i, v in enumerate(module):
-        res = []
-        special_module_list = []
-        spring_table, fall_table = [False, False, False], [False, False, False]
-
-        for _, w in enumerate(v):
-            if w in SPRING_MODULE_LIST:
-                spring_table[SPRING_MODULE_LIST.index(w)] = True
-            elif w in FALL_MODULE_LIST:
-                fall_table[FALL_MODULE_LIST.index(w)] = True
-            # 夏季休業中 or 春季休業中
-            else:
-                special_module_list.append(w)
+    with open_csv(input_file) as csv_file:
+        for row in read_csv_rows(csv_file):
+            yield Subject.from_csv_list(row)
 
-        if any(spring_table):
-            res.append(check_table(spring_table, "春"))
-        if any(fall_table):
-            res.append(check_table(fall_table, "秋"))
 
-        for element in special_module_list:
-            res.append(element)
-
-        module[i] = res
+def parse_timetable(table: PeriodTable) -> List[str]:
+    mask, flags = table
 
-    return module
+    if mask == 0:
+        # 範囲外の時限しかなかった学期は、曜時限なしとして扱う
+        if flags == INVALID:
+            return []
+        return [SENTINEL_PERIOD[flags]]
 
+    periods = []
+    # 下位ビットから順に取り出すと、曜日・時限の順に並ぶ
+    while mask:
+        lowest = mask & -mask
+        periods.append(PERIOD_LABELS[lowest.bit_length() - 1])
+        mask ^= lowest
 
-def check_table(table: List[bool], season: Literal["春", "秋"]) -> str:
-    """
-    This function checks the module table and returns the corresponding module
-    string.
+    return periods
 
-    Args:
-        table (List[bool]): The module table.
-        season (Literal["春", "秋"]): The season.
-
-    Example:
-        check_table([True, False, True], "春") -> "春AC"
-        check_table([False, False, True], "秋") -> "秋C"
-        check_table([False, False, False], "春") -> ValueError
-    """
 
-    if not any(table):
-        raise ValueError("No module found in the table.")
+def convert_csv_to_twinc_json(
+    lang: Lang, input_file: str, output_file: str, pretty: bool = False
+) -> None:
+    """This function converts the CSV file to a JSON file in the TwinC format."""
+    # 科目名の言語は変換全体で共通なので、取り出し方を一度だけ決める
+    get_name = attrgetter("name" if lang == "ja" else "english_name")
+    # 1行ずつ読み込んで変換し、Subjectは保持しない
+    classes = {
+        subject.class_id: subject_to_class(subject, get_name(subject))
+        for subject in subjects_from_csv(input_file=input_file)
+    }
 
-    return season + "".join([x for x, y in zip(["A", "B", "C"], table) if y])
+    dump_json(classes, output_file, pretty=pretty)
+    logging.info("Successfully converted CSV to JSON.")
 
 
-def subjects_from_csv(input_file: str) -> List[Subject]:
+def parse_period(raw_period: str) -> List[PeriodTable]:
     """
-    This function reads the CSV file and creates a list of Subject dataclass
-    instances.
+    This function parses the raw period string into a timetable per term.
+    A period outside 1 to PERIODS_PER_DAY is logged and skipped. A term that
+    only has such periods is flagged with INVALID, and parse_timetable
+    returns no period for it instead of "随時".
 
     Args:
-        input_file (str): The input CSV file.
-        lang (Lang): The language code.
+        raw_period (str): The raw period string.
 
     Returns:
-        List[Subject]: A list of Subject dataclass instances.
+        List[PeriodTable]: A list of timetables, one for each term.
     """
-    with open(input_file, mode="r", encoding="utf-8") as csv_file:
-        csv_reader = csv.DictReader(csv_file, fieldnames=Subject.CSV_HEADER)
-        next(csv_reader)  # Skip the header row
-
-        return [Subject.from_csv_row(row) for row in csv_reader]
+    boolean_periods: List[PeriodTable] = []
 
+    for term in raw_period.split(" "):
+        period = 0
+        invalid = False
+        day_array: List[int] = []
 
-def create_timetable():
-    """This function creates an empty timetable."""
-    return [[False] * 8 for _ in range(7)]
+        for p in term.split(","):
+            days = [
+                WEEKDAY_INDEX[x]
+                for x in p.translate(DELETE_TIME_CHARS).split("・")
+                if x in WEEKDAY_INDEX
+            ]
 
+            if len(days) > 0:
+                day_array = days
 
-def parse_timetable(table: PeriodTable) -> List[str]:
-    blank_table = create_timetable()
+            time_str = NON_TIME_CHARS_RE.sub("", p)
+            if time_str == "" or not day_array:
+                continue
 
-    if table["period"] == blank_table:
-        if table["focus"]:
-            return ["集中"]
-        elif table["negotiable"]:
-            return ["応談"]
-        else:
-            return ["随時"]
+            times = parse_time_range(time_str)
+            if times is None:
+                logging.warning("Skipped invalid period %s in %s", p, raw_period)
+                invalid = True
+                continue
+            for day in day_array:
+                period |= times << (day * PERIODS_PER_DAY)
 
-    return [
-        WEEKDAY_LIST[i] + str(j + 1)
-        for i in range(7)
-        for j in range(8)
-        if table["period"][i][j]
-    ]
+        # フラグは時間割が空のときだけ使う
+        flags = term_flags(term, invalid) if period == 0 else 0
+        boolean_periods.append((period, flags))
 
+    return boolean_periods
 
-def convert_csv_to_twinc_json(lang: Lang, input_file: str, output_file: str) -> None:
-    """This function converts the CSV file to a JSON file in the TwinC format."""
-    subjects = subjects_from_csv(input_file=input_file)
-    classes = {
-        subject.class_id: asdict(subject_to_class(lang, subject))
-        for subject in subjects
-    }
 
-    with open(output_file, "w", encoding="utf_8") as f:
-        enc = json.dumps(classes, ensure_ascii=False, indent=2)
-        f.write(enc)
-        logging.info("Successfully converted CSV to JSON.")
-
-
-def subject_to_class(lang: Lang, subject: Subject) -> Class:
+def term_flags(term: str, invalid: bool) -> int:
     """
-    This function converts a Subject instance to a dictionary.
+    This function returns the flag of a term whose timetable is empty.
 
     Args:
-        lang (Lang): The language code.
-        subject (Subject): The Subject instance.
+        term (str): The raw period string of the term.
+        invalid (bool): Whether an invalid period was skipped in the term.
 
     Returns:
-        Dict[str, str]: A dictionary containing the class information.
+        int: FOCUS, NEGOTIABLE, ASNEEDED or INVALID, or 0 if none applies.
     """
-    terms = raw_module_to_terms(subject.module)
-    boolean_periods: List[PeriodTable] = []
+    # 優先度の高いものだけを調べる
+    if "集中" in term:
+        return FOCUS
+    if "応談" in term:
+        return NEGOTIABLE
+    if "随時" in term:
+        return ASNEEDED
+    if invalid:
+        return INVALID
+    return 0
+
+
+def parse_time_range(time_str: str) -> Optional[int]:
+    """
+    This function converts a time range such as "3-4" or "5" into a bitmask
+    of the periods in one day.
 
-    term_str_array = subject.period.split(" ")
-
-    for i, term in enumerate(term_str_array):
-        period_str_array = term.split(",")
-        day_array = []
-        boolean_periods.append(
-            {
-                "focus": term.find("集中") > -1,
-                "negotiable": term.find("応談") > -1,
-                "asneeded": term.find("随時") > -1,
-                "period": create_timetable(),
-            }
-        )
-
-        for p in period_str_array:
-            days = [
-                WEEKDAY_LIST.index(x)
-                for x in re.sub("[0-9\\-]", "", p).split("・")
-                if x in WEEKDAY_LIST
-            ]
+    Args:
+        time_str (str): The time range without the day of the week.
 
-            if len(days) > 0:
-                day_array = days
+    Returns:
+        Optional[int]: The bitmask, 0 if the range is reversed, or None if
+        the range is outside 1 to PERIODS_PER_DAY.
+    """
+    if time_str.find("-") > -1:
+        start_time, end_time = map(int, time_str.split("-"))
+    else:
+        start_time = end_time = int(time_str)
 
-            time_array: List[int] = []
-            time_str = re.sub("[^0-9\\-]", "", p)
+    if start_time > end_time:
+        return 0
+    if start_time < 1 or end_time > PERIODS_PER_DAY:
+        return None
+    # 1日分の時限start_time〜end_timeのビットをまとめて立てる
+    return (1 << end_time) - (1 << (start_time - 1))
 
-            if time_str.find("-") > -1:
-                time_str_array = time_str.split("-")
-                start_time, end_time = map(int, time_str_array)
-                for j in range(start_time, end_time + 1, 1):
-                    time_array.append(j)
 
-            else:
-                if time_str != "":
-                    time_array.append(int(time_str))
-                else:
-                    time_array.append(0)
+def subject_to_class(subject: Subject, name: Optional[str]) -> Class:
+    """
+    This function converts a Subject instance to a dictionary.
 
-            if len(time_str) > 0:
-                for day in day_array:
-                    for time in time_array:
-                        boolean_periods[i]["period"][day][time - 1] = True
+    Args:
+        subject (Subject): The Subject instance.
+        name (Optional[str]): The subject name in the output language.
 
-    period_ = [parse_timetable(x) for x in boolean_periods]
-    parsed_terms = parsed_module(terms) if terms != [[]] else [["通年"]]
+    Returns:
+        Class: A dictionary containing the class information.
+    """
+    terms = raw_module_to_terms(subject.module or "")
+    period_ = [parse_timetable(x) for x in parse_period(subject.period or "")]
+    parsed_terms = terms if terms != [[]] else [["通年"]]
 
     return Class(
         class_id=subject.class_id,
-        name=subject.name if lang == "ja" else subject.english_name,
+        name=name,
         module=parsed_terms,  # Module is stored in the 'Module' field
         period=period_,
         room=(
@@ -255,33 +266,48 @@ def raw_module_to_terms(raw_module: str) -> Terms:
     """
     This function converts the raw module string to a list of terms.
 
+    Each term is parsed in a single pass into its final module strings.
+
     Args:
         raw_module (str): The raw module string.
 
     Returns:
         Terms: A list of terms.
-    """
-    season_number = {"春": 0, "秋": 3}
-    module_number = {"A": 0, "B": 1, "C": 2}
 
+    Example:
+        raw_module_to_terms("春AB 秋C") -> [["春AB"], ["秋C"]]
+        raw_module_to_terms("春C 夏季休業中") -> [["春C"], ["夏季休業中"]]
+    """
     term_groups = raw_module.split(" ")
-    season = ""
+    season = -1
     terms = []
 
     for group_str in term_groups:
-        group = []
-
-        for char in list(group_str):
-            if char in SEASONS:
-                season = char
-
-            if season != "":
-                if char in ("A", "B", "C"):
-                    group.append(season_number[season] + module_number[char])
-                if char == "休":
-                    group.append(SEASONS.index(season) + 6)
-
-        module_group = [MODULE_LIST[x] for x in group]
+        # MODULE_LISTのx番目のモジュールがビットxに対応する
+        group = 0
+
+        for char in group_str:
+            action = MODULE_CHAR_TABLE.get(char)
+            if action is None:
+                continue
+
+            kind, value = action
+            if kind == "season":
+                season = value
+            elif season >= 0:
+                if kind == "module":
+                    group |= 1 << (season * 3 + value)
+                else:
+                    group |= 1 << (season + 6)
+
+        module_group = []
+        spring, fall = group & 0b111, group >> 3 & 0b111
+        if spring:
+            module_group.append(SPRING_MODULE_STR[spring])
+        if fall:
+            module_group.append(FALL_MODULE_STR[fall])
+        # 夏季休業中 or 春季休業中
+        module_group.extend(MODULE_LIST[x] for x in (6, 7) if group >> x & 1)
         terms.append(module_group)
 
     return terms
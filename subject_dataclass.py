@@ -51,37 +51,41 @@ Attributes:
     data_update_date (str): The date of data update for the subject.
     room (str): The room where the subject is held.
 
+An attribute is None when its column is missing from a short CSV row, as with
+csv.DictReader.
+
 """
 
+import functools
 from dataclasses import dataclass, field
-from typing import ClassVar, Dict, List
+from typing import ClassVar, Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Subject:
     """
     Represents a subject with its attributes.
     """
 
-    class_id: str
-    name: str
-    method: str
-    credits: str
-    standard_course_year: str
-    module: str
-    period: str
-    teaching_staff: str
-    class_outline: str
-    remarks: str
-    enrollment_application: str
-    enrollment_requirements: str
-    short_term_students_application: str
-    short_term_students_requirements: str
-    english_name: str
-    subject_code: str
-    requirement_subject_name: str
-    data_update_date: str
-    room: str = field(default=" ")  # デフォルト値を指定
+    class_id: Optional[str]
+    name: Optional[str]
+    method: Optional[str]
+    credits: Optional[str]
+    standard_course_year: Optional[str]
+    module: Optional[str]
+    period: Optional[str]
+    teaching_staff: Optional[str]
+    class_outline: Optional[str]
+    remarks: Optional[str]
+    enrollment_application: Optional[str]
+    enrollment_requirements: Optional[str]
+    short_term_students_application: Optional[str]
+    short_term_students_requirements: Optional[str]
+    english_name: Optional[str]
+    subject_code: Optional[str]
+    requirement_subject_name: Optional[str]
+    data_update_date: Optional[str]
+    room: Optional[str] = field(default=" ")  # デフォルト値を指定
 
     CSV_HEADER: ClassVar[List[str]] = [
         "科目番号",
@@ -106,34 +110,116 @@ class Subject:
     ]
 
     @classmethod
-    def from_csv_row(cls, row: Dict[str, str]) -> "Subject":
+    def from_csv_list(cls, row: List[Optional[str]]) -> "Subject":
         """
-        Creates a Subject instance from a CSV row.
+        Creates a Subject instance from a CSV row read by csv.reader.
 
         Args:
-            row (Dict[str, str]): A dictionary representing a row of CSV data.
+            row (List[str]): A list representing a row of CSV data.
 
         Returns:
             Subject: A Subject instance created from the CSV row.
         """
         return cls(
-            class_id=row["科目番号"],
-            name=row["科目名"],
-            method=row["授業方法"],
-            credits=row["単位数"].strip(),
-            standard_course_year=row["標準履修年次"],
-            module=row["実施学期"],
-            period=row["曜時限"],
-            teaching_staff=row["担当教員"],
-            class_outline=row["授業概要"],
-            enrollment_application=row["科目等履修生申請可否"],
-            enrollment_requirements=row["申請条件"],
-            short_term_students_application=row["短期留学生申請可否"],
-            short_term_students_requirements=row["申請条件"],
-            english_name=row["英語(日本語)科目名"],
-            subject_code=row["科目コード"],
-            requirement_subject_name=row["要件科目名"],
-            data_update_date=row["データ更新日"],
-            room=row.get("教室", " "),
-            remarks=row["備考"],
+            class_id=row[IDX_CLASS_ID],
+            name=row[IDX_NAME],
+            method=row[IDX_METHOD],
+            credits=normalize_credits(row[IDX_CREDITS]),
+            standard_course_year=row[IDX_STANDARD_COURSE_YEAR],
+            module=row[IDX_MODULE],
+            period=row[IDX_PERIOD],
+            teaching_staff=row[IDX_TEACHING_STAFF],
+            class_outline=row[IDX_CLASS_OUTLINE],
+            enrollment_application=row[IDX_ENROLLMENT_APPLICATION],
+            enrollment_requirements=row[IDX_REQUIREMENTS],
+            short_term_students_application=row[
+                IDX_SHORT_TERM_STUDENTS_APPLICATION
+            ],
+            short_term_students_requirements=row[IDX_REQUIREMENTS],
+            english_name=row[IDX_ENGLISH_NAME],
+            subject_code=row[IDX_SUBJECT_CODE],
+            requirement_subject_name=row[IDX_REQUIREMENT_SUBJECT_NAME],
+            data_update_date=row[IDX_DATA_UPDATE_DATE],
+            room=row[IDX_ROOM],
+            remarks=row[IDX_REMARKS],
         )
+
+    @staticmethod
+    def dict_from_csv_list(row: List[Optional[str]]) -> Dict[str, Optional[str]]:
+        """
+        Creates a dictionary equal to asdict(Subject) from a CSV row.
+
+        The converters that only need the dictionary use this directly, so no
+        Subject instance is created for them.
+
+        Args:
+            row (List[str]): A list representing a row of CSV data.
+
+        Returns:
+            Dict[str, str]: The subject's fields in declaration order.
+        """
+        return {
+            "class_id": row[IDX_CLASS_ID],
+            "name": row[IDX_NAME],
+            "method": row[IDX_METHOD],
+            "credits": normalize_credits(row[IDX_CREDITS]),
+            "standard_course_year": row[IDX_STANDARD_COURSE_YEAR],
+            "module": row[IDX_MODULE],
+            "period": row[IDX_PERIOD],
+            "teaching_staff": row[IDX_TEACHING_STAFF],
+            "class_outline": row[IDX_CLASS_OUTLINE],
+            "remarks": row[IDX_REMARKS],
+            "enrollment_application": row[IDX_ENROLLMENT_APPLICATION],
+            "enrollment_requirements": row[IDX_REQUIREMENTS],
+            "short_term_students_application": row[
+                IDX_SHORT_TERM_STUDENTS_APPLICATION
+            ],
+            "short_term_students_requirements": row[IDX_REQUIREMENTS],
+            "english_name": row[IDX_ENGLISH_NAME],
+            "subject_code": row[IDX_SUBJECT_CODE],
+            "requirement_subject_name": row[IDX_REQUIREMENT_SUBJECT_NAME],
+            "data_update_date": row[IDX_DATA_UPDATE_DATE],
+            "room": row[IDX_ROOM],
+        }
+
+
+@functools.lru_cache(maxsize=None)
+def normalize_credits(raw_credits: Optional[str]) -> Optional[str]:
+    """
+    Strips the credits value read from the CSV.
+
+    The number of distinct values is small, so the result is cached and the
+    same string object is shared by every row with the same credits.
+
+    Args:
+        raw_credits (Optional[str]): The credits value in the CSV, e.g. " 2.0",
+            or None if the column is missing.
+
+    Returns:
+        Optional[str]: The stripped credits value, e.g. "2.0".
+    """
+    return raw_credits.strip() if raw_credits is not None else None
+
+
+# CSVの列番号
+IDX_CLASS_ID = Subject.CSV_HEADER.index("科目番号")
+IDX_NAME = Subject.CSV_HEADER.index("科目名")
+IDX_METHOD = Subject.CSV_HEADER.index("授業方法")
+IDX_CREDITS = Subject.CSV_HEADER.index("単位数")
+IDX_STANDARD_COURSE_YEAR = Subject.CSV_HEADER.index("標準履修年次")
+IDX_MODULE = Subject.CSV_HEADER.index("実施学期")
+IDX_PERIOD = Subject.CSV_HEADER.index("曜時限")
+IDX_ROOM = Subject.CSV_HEADER.index("教室")
+IDX_TEACHING_STAFF = Subject.CSV_HEADER.index("担当教員")
+IDX_CLASS_OUTLINE = Subject.CSV_HEADER.index("授業概要")
+IDX_REMARKS = Subject.CSV_HEADER.index("備考")
+IDX_ENROLLMENT_APPLICATION = Subject.CSV_HEADER.index("科目等履修生申請可否")
+IDX_SHORT_TERM_STUDENTS_APPLICATION = Subject.CSV_HEADER.index("短期留学生申請可否")
+# "申請条件"は2列あるが、DictReaderと同様に後ろの列を使う
+IDX_REQUIREMENTS = (
+    len(Subject.CSV_HEADER) - 1 - Subject.CSV_HEADER[::-1].index("申請条件")
+)
+IDX_ENGLISH_NAME = Subject.CSV_HEADER.index("英語(日本語)科目名")
+IDX_SUBJECT_CODE = Subject.CSV_HEADER.index("科目コード")
+IDX_REQUIREMENT_SUBJECT_NAME = Subject.CSV_HEADER.index("要件科目名")
+IDX_DATA_UPDATE_DATE = Subject.CSV_HEADER.index("データ更新日")
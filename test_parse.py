@@ -5,14 +5,23 @@ The module includes test cases for converting CSV files to JSON format using dif
 It verifies the correctness of the conversion process and performs additional validation on the converted data.
 """
 
+import csv
 import os
+import shutil
+import tempfile
 import unittest
 import json
 import yaml
 from parse import convert_csv_to_json
 from parse_structural import convert_csv_to_structural_json
 from parse2yaml import convert_csv_to_yaml
-from parse_twinc import convert_csv_to_twinc_json
+import parse2xml
+from parse_twinc import (
+    convert_csv_to_twinc_json,
+    parse_period,
+    parse_timetable,
+    raw_module_to_terms,
+)
 from parse_gradcheck import convert_csv_to_gradcheck
 
 
@@ -73,6 +82,71 @@ class TestCSVtoJSONConversion(unittest.TestCase):
         # test_data/output.jsonを削除
         os.remove(output_json_path)
 
+    def test_conversion_pretty(self):
+        """
+        Test the conversion of CSV to indented JSON.
+
+        This method verifies that the output of each converter with pretty=True
+        is identical to the expected output JSON file, including its key order
+        and indentation.
+
+        Raises:
+            AssertionError: If the conversion result does not match the expected output.
+
+        """
+        input_csv_path = "sample_data/kdb.csv"
+        cases = [
+            (
+                lambda i, o: convert_csv_to_json(i, o, pretty=True),
+                "test_data/kdb_pretty.json",
+                "sample_data/kdb.json",
+            ),
+            (
+                lambda i, o: convert_csv_to_twinc_json("ja", i, o, pretty=True),
+                "test_data/kdb_twinc_pretty.json",
+                "sample_data/kdb_twinc.json",
+            ),
+            (
+                lambda i, o: convert_csv_to_twinc_json("en", i, o, pretty=True),
+                "test_data/kdb_twinc_en_pretty.json",
+                "sample_data/kdb_twinc_en.json",
+            ),
+            (
+                lambda i, o: convert_csv_to_structural_json(i, o, pretty=True),
+                "test_data/kdb_structural_pretty.json",
+                "sample_data/kdb_structural.json",
+            ),
+            (
+                lambda i, o: convert_csv_to_gradcheck(i, o, pretty=True),
+                "test_data/kdb_gradcheck_pretty.json",
+                "sample_data/kdb_gradcheck.json",
+            ),
+        ]
+
+        for convert, output_json_path, expected_output_path in cases:
+            with self.subTest(output=output_json_path):
+                # 変換を実行
+                convert(input_csv_path, output_json_path)
+
+                # 変換結果の検証
+                with open(output_json_path, mode="r", encoding="utf-8") as f:
+                    actual_text = f.read()
+
+                with open(expected_output_path, mode="r", encoding="utf-8") as f:
+                    expected_text = f.read()
+
+                # kdb_gradcheck.jsonはインデントなしで保存されているので、
+                # キーの順序を保ったままインデント付きの形式に揃える
+                if "\n" not in expected_text:
+                    expected_text = json.dumps(
+                        json.loads(expected_text), ensure_ascii=False, indent=2
+                    )
+
+                # kdb_structural.jsonだけは末尾に改行がある
+                self.assertEqual(actual_text, expected_text.rstrip("\n"))
+
+                os.remove(output_json_path)
+
     def test_parse_structural(self):
         """
         Test the conversion of CSV to structured JSON.
@@ -302,6 +376,275 @@ class TestCSVtoJSONConversion(unittest.TestCase):
         # test_data/kdb_gradcheck.jsonを削除
         os.remove(output_json_path)
 
+    def test_blank_lines(self):
+        """
+        Test the conversion of CSV containing blank lines.
+
+        This method verifies that blank lines in the input CSV file, including a
+        trailing one, are skipped and the output is the same as for the sample CSV.
+
+        Raises:
+            AssertionError: If the conversion result does not match the expected output.
+
+        """
+        input_csv_path = "test_data/kdb_blank_lines.csv"
+
+        # サンプルCSVの途中と末尾に空行を入れたファイルを作る
+        with open(
+            "sample_data/kdb.csv", mode="r", encoding="utf-8", newline=""
+        ) as f:
+            lines = f.readlines()
+        lines.insert(2, "\r\n")
+        lines.append("\r\n")
+        with open(input_csv_path, mode="w", encoding="utf-8", newline="") as f:
+            f.writelines(lines)
+
+        cases = [
+            (
+                convert_csv_to_json,
+                "test_data/kdb_blank_lines.json",
+                "sample_data/kdb.json",
+            ),
+            (
+                convert_csv_to_structural_json,
+                "test_data/kdb_blank_lines_structural.json",
+                "sample_data/kdb_structural.json",
+            ),
+            (
+                convert_csv_to_gradcheck,
+                "test_data/kdb_blank_lines_gradcheck.json",
+                "sample_data/kdb_gradcheck.json",
+            ),
+        ]
+        for lang, suffix in (("ja", ""), ("en", "_en")):
+            cases.append(
+                (
+                    lambda i, o, lang=lang: convert_csv_to_twinc_json(lang, i, o),
+                    f"test_data/kdb_blank_lines_twinc{suffix}.json",
+                    f"sample_data/kdb_twinc{suffix}.json",
+                )
+            )
+        for convert, output_json_path, expected_output_path in cases:
+            with self.subTest(output=output_json_path):
+                # 変換を実行
+                convert(input_csv_path, output_json_path)
+
+                with open(output_json_path, mode="r", encoding="utf-8") as f:
+                    actual_data = json.load(f)
+                with open(expected_output_path, mode="r", encoding="utf-8") as f:
+                    expected_data = json.load(f)
+
+                self.assertDictEqual(actual_data, expected_data)
+                os.remove(output_json_path)
+
+        output_yaml_path = "test_data/kdb_blank_lines.yaml"
+        convert_csv_to_yaml(input_csv_path, output_yaml_path)
+        with open(output_yaml_path, mode="r", encoding="utf-8") as f:
+            actual_yaml = yaml.safe_load(f)
+        with open("sample_data/kdb.yaml", mode="r", encoding="utf-8") as f:
+            expected_yaml = yaml.safe_load(f)
+        self.assertListEqual(actual_yaml, expected_yaml)
+        os.remove(output_yaml_path)
+
+        # test_data/kdb_blank_lines.csvを削除
+        os.remove(input_csv_path)
+
+    def test_short_row(self):
+        """
+        Test the conversion of CSV containing a row with missing columns.
+
+        This method verifies that the missing columns of a short row are
+        converted to None, as csv.DictReader does.
+
+        Raises:
+            AssertionError: If the conversion result does not match the expected output.
+
+        """
+        input_csv_path = "test_data/kdb_short_row.csv"
+        output_json_path = "test_data/kdb_short_row_structural.json"
+
+        # 見出しと1行目の科目から末尾の2列を削ったCSVを作る
+        with open(
+            "sample_data/kdb.csv", mode="r", encoding="utf-8", newline=""
+        ) as f:
+            rows = list(csv.reader(f))[:2]
+        rows = [row[:-2] for row in rows]
+        with open(input_csv_path, mode="w", encoding="utf-8", newline="") as f:
+            csv.writer(f).writerows(rows)
+
+        # 変換を実行
+        convert_csv_to_structural_json(input_csv_path, output_json_path)
+
+        with open(output_json_path, mode="r", encoding="utf-8") as f:
+            actual_data = json.load(f)
+        with open("sample_data/kdb_structural.json", mode="r", encoding="utf-8") as f:
+            expected_course = json.load(f)["courses"][0]
+        expected_course["requirement_subject_name"] = None
+        expected_course["data_update_date"] = None
+
+        self.assertListEqual(actual_data["courses"], [expected_course])
+
+        # 作成したファイルを削除
+        os.remove(output_json_path)
+        os.remove(input_csv_path)
+
+
+class TestParseTwinc(unittest.TestCase):
+    """
+    Unit tests for the module and period parsers used by the TwinC conversion.
+    """
+
+    def test_parse_period(self):
+        """
+        Test parsing raw period strings into timetables.
+
+        Raises:
+            AssertionError: If the parsed timetables do not match the expected ones.
+
+        """
+        cases = {
+            "月1,2": [["月1", "月2"]],
+            "月・水3-4": [["月3", "月4", "水3", "水4"]],
+            "木1 金2": [["木1"], ["金2"]],
+            "水5,6 集中": [["水5", "水6"], ["集中"]],
+            "集中": [["集中"]],
+            "応談": [["応談"]],
+            "随時": [["随時"]],
+        }
+        for raw_period, expected in cases.items():
+            with self.subTest(raw_period=raw_period):
+                actual = [parse_timetable(x) for x in parse_period(raw_period)]
+                self.assertListEqual(actual, expected)
+
+    def test_parse_period_invalid(self):
+        """
+        Test that an out-of-range period is skipped with a warning.
+
+        A term that only has out-of-range periods has no period, rather than
+        being reported as "随時".
+
+        Raises:
+            AssertionError: If the invalid period is not skipped or not logged.
+
+        """
+        # 0時限は範囲外なので、その部分だけを読み飛ばす
+        cases = {
+            "月0": [[]],
+            "月1,0-4木": [["月1"]],
+            "水0 集中": [[], ["集中"]],
+        }
+        for raw_period, expected in cases.items():
+            with self.subTest(raw_period=raw_period):
+                with self.assertLogs(level="WARNING") as logs:
+                    actual = [parse_timetable(x) for x in parse_period(raw_period)]
+                self.assertListEqual(actual, expected)
+                self.assertEqual(len(logs.records), 1)
+
+    def test_raw_module_to_terms(self):
+        """
+        Test splitting raw module strings into terms.
+
+        Raises:
+            AssertionError: If the terms do not match the expected ones.
+
+        """
+        cases = {
+            "春AB 秋C": [["春AB"], ["秋C"]],
+            "春C 夏季休業中": [["春C"], ["夏季休業中"]],
+            "春ABC秋ABC": [["春ABC", "秋ABC"]],
+            "秋A": [["秋A"]],
+            "通年": [[]],
+        }
+        for raw_module, expected in cases.items():
+            with self.subTest(raw_module=raw_module):
+                self.assertListEqual(raw_module_to_terms(raw_module), expected)
+
+
+class TestParse2XML(unittest.TestCase):
+    """
+    Unit tests for CSV to XML conversion.
+
+    The translations.json and csvHeader.json files read by parse2xml are
+    written to a temporary directory, and the conversion is run there.
+    """
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+
+        with open("translations.json", mode="w", encoding="utf-8") as f:
+            json.dump({"ja": {"courses": "courses", "course": "course"}}, f)
+        with open("csvHeader.json", mode="w", encoding="utf-8") as f:
+            json.dump({"ja": ["Class ID", "Name", "Remarks(Note)"]}, f)
+
+        # 読み込んだファイルがキャッシュされないようにする
+        parse2xml.get_translations.cache_clear()
+        parse2xml.course_enum.cache_clear()
+
+    def tearDown(self):
+        parse2xml.get_translations.cache_clear()
+        parse2xml.course_enum.cache_clear()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp_dir)
+
+    def convert(self, csv_text):
+        """
+        Converts the given CSV text to XML and returns the output.
+        """
+        with open("kdb.csv", mode="w", encoding="utf-8", newline="") as f:
+            f.write(csv_text)
+        parse2xml.main("kdb.csv", "kdb.xml", "ja")
+        with open("kdb.xml", mode="rb") as f:
+            return f.read().decode("utf-8")
+
+    def test_escape_and_empty_cells(self):
+        """
+        Test that special characters are escaped and empty cells are empty tags.
+
+        Raises:
+            AssertionError: If the conversion result does not match the expected output.
+
+        """
+        actual = self.convert(
+            'Class ID,Name,Remarks(Note)\r\nA&1,"<b> ""q"" \'a\'",\r\nB2,,x\r\n'
+        )
+        expected = (
+            "<courses>"
+            "<course><class_id>A&amp;1</class_id>"
+            "<name>&lt;b&gt; \"q\" 'a'</name><remarksnote /></course>"
+            "<course><class_id>B2</class_id><name /><remarksnote>x</remarksnote>"
+            "</course>"
+            "</courses>"
+        )
+        self.assertEqual(actual, expected)
+
+    def test_multiline_cell(self):
+        """
+        Test that a line break inside a quoted cell is read as "\\n".
+
+        Raises:
+            AssertionError: If the conversion result does not match the expected output.
+
+        """
+        actual = self.convert('Class ID,Name,Remarks(Note)\r\nA1,"x\r\ny",z\r\n')
+        expected = (
+            "<courses><course><class_id>A1</class_id><name>x\ny</name>"
+            "<remarksnote>z</remarksnote></course></courses>"
+        )
+        self.assertEqual(actual, expected)
+
+    def test_header_only(self):
+        """
+        Test that a CSV without any course becomes an empty courses element.
+
+        Raises:
+            AssertionError: If the conversion result does not match the expected output.
+
+        """
+        actual = self.convert("Class ID,Name,Remarks(Note)\r\n")
+        self.assertEqual(actual, "<courses />")
+
 
 if __name__ == "__main__":
     unittest.main()